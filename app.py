@@ -1,7 +1,11 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from scraper import fetch_all_projects, process_projects
+from description_store import DescriptionStore
+from grid import build_sort_indexes, page_positions, PAGE_SIZES
+from rollups import update_rollups, load_submissions, load_track_snapshots
 
 # Set Page Config
 st.set_page_config(
@@ -49,6 +53,43 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_description_store():
+    # One store (and its decompression cache) shared by every session
+    return DescriptionStore()
+
+store = get_description_store()
+
+def render_trends():
+    """Trends charts, read from the stored rollups so they need no mined data in this session."""
+    st.subheader("Submission Activity")
+    grain = st.radio("Granularity", ["day", "hour"], horizontal=True, format_func=str.title)
+
+    # Rendered from the pre-aggregated rollups, never from the raw rows
+    submissions = load_submissions(grain=grain)
+    snapshots = load_track_snapshots(grain=grain)
+    if submissions is None or snapshots is None:
+        st.info("No rollups yet. They are updated every time data is mined.")
+    else:
+        st.markdown("#### Submissions per " + grain.title())
+        fig_subs = px.bar(submissions, x='bucket', y='submissions', color='track')
+        st.plotly_chart(fig_subs, use_container_width=True)
+
+        t1, t2 = st.columns(2)
+        with t1:
+            st.markdown("#### Likes Over Time")
+            likes = snapshots.groupby('bucket', as_index=False)['likes'].sum()
+            fig_likes = px.line(likes, x='bucket', y='likes', markers=True)
+            st.plotly_chart(fig_likes, use_container_width=True)
+        with t2:
+            st.markdown("#### Deployment Rate by Track")
+            rates = snapshots[snapshots['projects'] > 0].assign(
+                deployment_rate=lambda t: t['deployed'] / t['projects'] * 100
+            )
+            fig_rate = px.line(rates, x='bucket', y='deployment_rate', color='track', markers=True,
+                               labels={'deployment_rate': 'Deployment Rate (%)'})
+            st.plotly_chart(fig_rate, use_container_width=True)
+
 # Sidebar
 with st.sidebar:
     st.title("🌊 DeepSurge Intelligence")
@@ -79,6 +120,7 @@ st.title("DeepSurge Intelligence Dashboard")
 
 if "data" not in st.session_state:
     st.session_state.data = None
+    st.session_state.sort_indexes = None
 
 if start_btn:
     progress_bar = st.progress(0)
@@ -95,8 +137,10 @@ if start_btn:
             
             if raw_projects:
                 status_text.text("Processing data and calculating scores...")
-                df = process_projects(raw_projects)
+                df = process_projects(raw_projects, store=store)
                 st.session_state.data = df
+                st.session_state.sort_indexes = build_sort_indexes(df)
+                update_rollups(df)
                 status_text.success(f"Successfully mined {len(df)} projects!")
                 progress_bar.empty()
             else:
@@ -119,7 +163,7 @@ if st.session_state.data is not None:
     )
 
     # Tabs
-    tab1, tab2 = st.tabs(["📊 Macro Overview", "🔎 Detail Grid"])
+    tab1, tab2, tab3 = st.tabs(["📊 Macro Overview", "🔎 Detail Grid", "📈 Trends"])
     
     with tab1:
         st.subheader("Market Overview")
@@ -174,30 +218,65 @@ if st.session_state.data is not None:
             statuses = ["All"] + list(df['status'].unique()) if 'status' in df.columns else ["All"]
             selected_status = st.selectbox("Filter by Status", statuses)
         with f3:
-            search_term = st.text_input("Search Projects", placeholder="Project Name or Description...")
+            search_term = st.text_input("Search Projects", placeholder="Project Name or Description Preview...")
             
-        # Apply Filters
-        filtered_df = df.copy()
+        # Apply Filters (as a row mask; rows are only materialized for the visible page)
+        mask = np.ones(len(df), dtype=bool)
         if selected_track != "All":
-            filtered_df = filtered_df[filtered_df['track'] == selected_track]
+            mask &= (df['track'] == selected_track).to_numpy()
         if selected_status != "All":
-            filtered_df = filtered_df[filtered_df['status'] == selected_status]
+            mask &= (df['status'] == selected_status).to_numpy()
         if search_term:
-            filtered_df = filtered_df[
-                filtered_df['projectName'].str.contains(search_term, case=False, na=False) |
-                filtered_df['description_clean'].str.contains(search_term, case=False, na=False)
-            ]
-            
+            mask &= (
+                df['projectName'].str.contains(search_term, case=False, na=False) |
+                df['description_preview'].str.contains(search_term, case=False, na=False)
+            ).to_numpy()
+
+        # Sorting, paging and column projection
+        sort_indexes = st.session_state.sort_indexes
+        grid_columns = [
+            'projectName', 'description_preview', 'track', 'status', 'deployNetwork', 
+            'packageId', 'github_url', 'website_url', 'youtube_url',
+            'likeCount', 'createdAt'
+        ]
+        s1, s2, s3, s4 = st.columns([2, 1, 1, 1])
+        with s1:
+            sort_by = st.selectbox("Sort by", list(sort_indexes))
+        with s2:
+            ascending = st.radio("Order", ["Ascending", "Descending"], horizontal=True) == "Ascending"
+        with s3:
+            page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1)
+        with s4:
+            total = int(mask.sum())
+            page_count = max(1, -(-total // page_size))
+            page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1)
+        columns = st.multiselect("Columns", grid_columns, default=grid_columns)
+
         # Display Grid
-        st.dataframe(
-            filtered_df[[
-                'projectName', 'description', 'track', 'status', 'deployNetwork', 
-                'packageId', 'github_url', 'website_url', 'youtube_url',
-                'likeCount', 'createdAt'
-            ]],
+        positions, total = page_positions(sort_indexes[sort_by], mask, ascending, page, page_size)
+        st.caption(f"Showing {len(positions)} of {total} projects")
+        event = st.dataframe(
+            df.iloc[positions][columns],
             use_container_width=True,
-            height=600
+            height=600,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row"
         )
 
+        # Full description is only loaded for the selected row
+        if event.selection.rows:
+            row = df.iloc[positions[event.selection.rows[0]]]
+            with st.expander(f"📄 {row['projectName']}", expanded=True):
+                description_html = store.get_html(row['description_hash'])
+                if description_html:
+                    st.markdown(description_html, unsafe_allow_html=True)
+                else:
+                    st.info("No description available.")
+
+    with tab3:
+        render_trends()
+
 else:
     st.info("👈 Click 'Start Mining' in the sidebar to fetch the latest hackathon data.")
+    render_trends()
@@ -0,0 +1,91 @@
+"""
+Content-addressed, compressed storage for project descriptions.
+
+Descriptions are stored once per distinct HTML body, keyed by its SHA-256. HTML is
+stripped once at ingest; DataFrames only carry the hash, a short plain-text preview
+and the text length, and full bodies are read back on demand.
+"""
+
+import os
+import zlib
+import hashlib
+import tempfile
+from functools import lru_cache
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+STORE_DIR = os.getenv(
+    'DESCRIPTION_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.description_store'),
+)
+PREVIEW_CHARS = 200
+
+
+class DescriptionStore:
+    """
+    On-disk store laid out as ``<root>/<hash[:2]>/<hash>.html.<zst|zz>``.
+
+    Uses zstd when ``zstandard`` is installed, zlib otherwise. Safe to share between
+    threads and processes: bodies are written to a unique temp file and renamed into place.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or STORE_DIR
+        self.ext = 'zst' if zstandard else 'zz'
+        # Only bodies of rows the user actually opened; shared by every caller of this instance
+        self.get_html = lru_cache(maxsize=256)(self._load)
+
+    def _path(self, digest):
+        return os.path.join(self.root, digest[:2], f"{digest}.html.{self.ext}")
+
+    def _compress(self, data):
+        if zstandard:
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return zlib.compress(data, 9)
+
+    def _decompress(self, data):
+        if zstandard:
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def _load(self, digest):
+        """Return the stored HTML for ``digest``, or None if it is missing."""
+        if not digest:
+            return None
+        try:
+            with open(self._path(digest), 'rb') as f:
+                return self._decompress(f.read()).decode('utf-8')
+        except OSError:
+            return None
+
+    def has(self, digest):
+        """Return True if the HTML for ``digest`` is stored."""
+        return os.path.exists(self._path(digest))
+
+    def put(self, html):
+        """
+        Store an HTML description.
+
+        Returns:
+            str: The SHA-256 hex digest of ``html``.
+        """
+        digest = hashlib.sha256(html.encode('utf-8')).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            return digest
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._compress(html.encode('utf-8')))
+            # Content-addressed: if another writer got there first, its file is identical
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return digest
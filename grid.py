@@ -0,0 +1,61 @@
+"""
+Server-side paging, sorting and column projection for the Detail Grid.
+
+Sort orders are computed once per dataset; each rerun only filters the precomputed
+order and slices out one page, so the browser receives a fixed number of rows.
+"""
+
+import numpy as np
+import pandas as pd
+
+SORTABLE_COLUMNS = [
+    'projectName', 'track', 'status', 'deployNetwork', 'likeCount', 'createdAt', 'updatedAt',
+]
+PAGE_SIZES = [25, 50, 100]
+
+
+def build_sort_indexes(df, columns=SORTABLE_COLUMNS):
+    """
+    Precompute the ascending row order of each sortable column.
+
+    Strings sort case-insensitively; missing values always go last.
+
+    Returns:
+        dict: column -> (positions, n_valid), where ``positions`` holds the row
+        positions of the valid values in ascending order followed by the missing ones.
+    """
+    indexes = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        values = df[col].reset_index(drop=True)
+        valid = values.dropna()
+        if not pd.api.types.is_numeric_dtype(valid):
+            valid = valid.astype(str).str.casefold()
+        order = valid.sort_values(kind='stable').index.to_numpy()
+        missing = np.flatnonzero(values.isna().to_numpy())
+        indexes[col] = (np.concatenate([order, missing]).astype(np.intp), len(order))
+    return indexes
+
+
+def page_positions(sort_index, mask=None, ascending=True, page=1, page_size=50):
+    """
+    Select the row positions for one page.
+
+    Args:
+        sort_index (tuple): An entry from ``build_sort_indexes``.
+        mask (ndarray): Optional boolean filter over all rows.
+        ascending (bool): Sort direction (missing values stay last either way).
+        page (int): 1-based page number.
+        page_size (int): Rows per page.
+
+    Returns:
+        tuple[ndarray, int]: (row positions for the page, total rows matching the filter)
+    """
+    order, n_valid = sort_index
+    if not ascending:
+        order = np.concatenate([order[:n_valid][::-1], order[n_valid:]])
+    if mask is not None:
+        order = order[mask[order]]
+    start = (page - 1) * page_size
+    return order[start:start + page_size], len(order)
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Headless DeepSurge pipeline: fetch -> normalize -> enrich/score/rollup -> export -> fork.
+
+Every stage caches its output under the cache directory, keyed by a content hash of
+its inputs and parameters. Re-running after an upstream change only redoes the stages
+whose inputs actually changed, and stages whose inputs are ready run in parallel.
+
+Usage:
+    python pipeline.py                  # fetch through export and rollup (writes walrus_haulout_data.csv)
+    python pipeline.py fork             # full run, including forking to the target org
+    python pipeline.py score --no-fetch # reuse the last fetched snapshot
+"""
+
+import os
+import sys
+import json
+import pickle
+import hashlib
+import argparse
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from scraper import (
+    fetch_all_projects,
+    process_projects,
+    enrich_projects,
+    score_projects,
+)
+from description_store import DescriptionStore
+from rollups import update_rollups, ROLLUP_DB
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.getenv('PIPELINE_CACHE_DIR', os.path.join(ROOT, '.pipeline_cache'))
+
+# Bump when a stage's logic changes so previously cached outputs are invalidated
+CACHE_VERSION = 3
+
+# deps: upstream stage names, passed positionally to run()
+# params: config attributes that affect the output (part of the cache key)
+# volatile: always re-run (fetch is reused instead with --no-fetch); its output hash still gates downstream
+# materialize: optional side effect applied to the output on every run, cached or not
+# check: optional predicate on a cached output; False means its side effects are gone, so re-run
+# inputs: optional columns the stage reads from its DataFrame deps; only these are passed in and
+#         hashed into the cache key, so changes to other columns do not re-run the stage
+Stage = namedtuple(
+    'Stage', ['deps', 'params', 'run', 'volatile', 'materialize', 'check', 'inputs'], defaults=(None, None)
+)
+
+
+def _fetch(config):
+    projects = fetch_all_projects(page_limit=config.page_limit)
+    if not projects:
+        # Stop before downstream stages overwrite the CSV and rollups with nothing
+        raise RuntimeError("fetch returned no projects. Please check your network or cookie.")
+    return projects
+
+
+def _export(normalized, enriched, scored, config):
+    df = normalized.merge(enriched, on='id').merge(scored, on='id')
+    return df.to_csv(index=False).encode('utf-8-sig')
+
+
+def _write_if_changed(path, payload):
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == payload:
+                return
+    with open(path, 'wb') as f:
+        f.write(payload)
+    print(f"Wrote {path}")
+
+
+def _descriptions_stored(df, config):
+    store = DescriptionStore()
+    return all(store.has(digest) for digest in df['description_hash'].dropna())
+
+
+def _fork(csv_bytes, config):
+    env = dict(
+        os.environ,
+        CSV_FILE=os.path.abspath(config.output),
+        REPORT_FILE=os.path.abspath(config.report),
+        TARGET_ORG=config.target_org,
+        SYNC_EXISTING_FORKS=str(config.sync_existing_forks).lower(),
+    )
+    script = os.path.join(ROOT, 'scripts', 'fork_projects.py')
+    result = subprocess.run([sys.executable, script], env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"fork_projects.py exited with status {result.returncode}")
+    with open(config.report, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+STAGES = {
+    'fetch': Stage(
+        deps=(), params=('page_limit',), volatile=True, materialize=None,
+        run=_fetch,
+    ),
+    'normalize': Stage(
+        deps=('fetch',), params=(), volatile=False, materialize=None,
+        run=lambda raw, config: process_projects(raw),
+        # process_projects writes descriptions to the store, which the stage cache does not track
+        check=_descriptions_stored,
+    ),
+    'enrich': Stage(
+        deps=('normalize',), params=('check_github',), volatile=False, materialize=None,
+        run=lambda df, config: enrich_projects(df, check_github=config.check_github),
+        inputs=('id', 'github_url', 'website_url', 'youtube_url'),
+    ),
+    'score': Stage(
+        deps=('normalize',), params=(), volatile=False, materialize=None,
+        run=lambda df, config: score_projects(df),
+        inputs=('id', 'github_url', 'packageId', 'website_url', 'description_length'),
+    ),
+    'rollup': Stage(
+        # The database carries state across runs and already skips unchanged projects,
+        # so always apply the snapshot (a cache hit would miss e.g. likes returning to an old value)
+        deps=('normalize',), params=('rollup_db',), volatile=True, materialize=None,
+        run=lambda df, config: update_rollups(df, db_path=config.rollup_db),
+    ),
+    'export': Stage(
+        deps=('normalize', 'enrich', 'score'), params=(), volatile=False,
+        run=_export,
+        materialize=lambda payload, config: _write_if_changed(config.output, payload),
+    ),
+    'fork': Stage(
+        # Side effects on GitHub and transient failures: always re-run so failed repos are retried
+        deps=('export',), params=('target_org', 'sync_existing_forks'), volatile=True,
+        run=_fork,
+        materialize=lambda report, config: _write_if_changed(
+            config.report, json.dumps(report, indent=2, ensure_ascii=False).encode('utf-8')
+        ),
+    ),
+}
+
+
+def content_digest(value):
+    """Hash a stage output by content, so identical outputs yield identical digests."""
+    if isinstance(value, bytes):
+        payload = value
+    elif hasattr(value, 'to_json'):
+        payload = value.to_json(orient='split', date_format='iso').encode('utf-8')
+    else:
+        payload = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+def stage_key(name, dep_digests, config):
+    stage = STAGES[name]
+    material = {
+        'version': CACHE_VERSION,
+        'stage': name,
+        'inputs': dep_digests,
+        'params': {p: getattr(config, p) for p in stage.params},
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class StageCache:
+    """On-disk cache of one stage's outputs: ``<key>.pkl`` plus a ``<key>.json`` digest record."""
+
+    def __init__(self, cache_dir, name):
+        self.dir = os.path.join(cache_dir, name)
+
+    def _path(self, key, ext):
+        return os.path.join(self.dir, f"{key}.{ext}")
+
+    def digest(self, key):
+        """Return the stored output digest for ``key``, or None on a miss."""
+        try:
+            with open(self._path(key, 'json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta['digest'] if os.path.exists(self._path(key, 'pkl')) else None
+
+    def load(self, key):
+        with open(self._path(key, 'pkl'), 'rb') as f:
+            return pickle.load(f)
+
+    def store(self, key, value):
+        os.makedirs(self.dir, exist_ok=True)
+        digest = content_digest(value)
+        with open(self._path(key, 'pkl'), 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # Written last: a key only counts as cached once its record exists
+        with open(self._path(key, 'json'), 'w', encoding='utf-8') as f:
+            json.dump({'digest': digest}, f)
+        with open(os.path.join(self.dir, 'latest'), 'w', encoding='utf-8') as f:
+            f.write(key)
+        return digest
+
+    def touch(self, key):
+        """Mark ``key`` as recently used, so pruning keeps it."""
+        os.utime(self._path(key, 'json'))
+
+    def prune(self, keep):
+        """Delete all but the ``keep`` most recently written or used keys."""
+        records = [os.path.join(self.dir, f) for f in os.listdir(self.dir) if f.endswith('.json')]
+        records.sort(key=os.path.getmtime, reverse=True)
+        for record in records[keep:]:
+            key = os.path.basename(record)[:-len('.json')]
+            # Record first: without it the key is already a cache miss
+            for ext in ('json', 'pkl'):
+                try:
+                    os.remove(self._path(key, ext))
+                except OSError:
+                    pass
+
+    def latest(self):
+        try:
+            with open(os.path.join(self.dir, 'latest'), 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+
+def _project(lazy, columns):
+    """Narrow a DataFrame dep to ``columns`` and re-digest it."""
+    projected = lazy.get()[list(columns)]
+    return content_digest(projected), _Lazy(lambda: projected)
+
+
+class _Lazy:
+    """Load a cached output only when something actually needs it."""
+
+    def __init__(self, loader):
+        self._loader = loader
+        self._loaded = False
+        self._value = None
+
+    def get(self):
+        if not self._loaded:
+            self._value = self._loader()
+            self._loaded = True
+        return self._value
+
+
+def _run_stage(name, deps, config):
+    """
+    Run a single stage, or reuse its cached output.
+
+    Args:
+        deps (list): (digest, _Lazy) for each upstream stage, in ``Stage.deps`` order.
+
+    Returns:
+        tuple[str, _Lazy]: (output digest, lazy output)
+    """
+    stage = STAGES[name]
+    if stage.inputs:
+        deps = [_project(lazy, stage.inputs) for _, lazy in deps]
+    cache = StageCache(config.cache_dir, name)
+    key = stage_key(name, [digest for digest, _ in deps], config)
+
+    if name == 'fetch' and config.no_fetch:
+        key = cache.latest()
+        if key is None:
+            raise RuntimeError("--no-fetch: no fetched snapshot in the cache")
+        digest = cache.digest(key)
+    else:
+        digest = None if stage.volatile else cache.digest(key)
+
+    output = _Lazy(lambda: cache.load(key))
+    if digest is not None and stage.check and not stage.check(output.get(), config):
+        print(f"[{name}] cached output is stale ({key[:12]})")
+        digest = None
+
+    if digest is not None:
+        print(f"[{name}] cached ({key[:12]})")
+        cache.touch(key)
+    else:
+        print(f"[{name}] running...")
+        value = stage.run(*[lazy.get() for _, lazy in deps], config)
+        digest = cache.store(key, value)
+        cache.prune(config.cache_keep)
+        output = _Lazy(lambda: value)
+        print(f"[{name}] done ({key[:12]})")
+
+    if stage.materialize:
+        stage.materialize(output.get(), config)
+    return digest, output
+
+
+def resolve(targets):
+    """Return the target stages and all of their ancestors."""
+    needed = set()
+    stack = list(targets)
+    while stack:
+        name = stack.pop()
+        if name not in STAGES:
+            raise ValueError(f"Unknown stage: {name}")
+        if name not in needed:
+            needed.add(name)
+            stack.extend(STAGES[name].deps)
+    return [name for name in STAGES if name in needed]
+
+
+def run_pipeline(targets, config):
+    """
+    Run ``targets`` and their upstream stages, executing independent stages in parallel.
+
+    Returns:
+        dict: stage name -> output digest
+    """
+    pending = resolve(targets)
+    results = {}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=config.jobs) as pool:
+        while pending or running:
+            ready = [n for n in pending if all(d in results for d in STAGES[n].deps)]
+            for name in ready:
+                pending.remove(name)
+                deps = [results[d] for d in STAGES[name].deps]
+                running[pool.submit(_run_stage, name, deps, config)] = name
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+
+    return {name: digest for name, (digest, _) in results.items()}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the DeepSurge data pipeline.")
+    parser.add_argument('targets', nargs='*', metavar='stage',
+                        help=f"Stages to build, with their dependencies: {', '.join(STAGES)} (default: export, rollup)")
+    parser.add_argument('--page-limit', type=int, default=1000,
+                        help="Maximum number of API pages to fetch")
+    parser.add_argument('--no-fetch', action='store_true',
+                        help="Reuse the last fetched snapshot instead of hitting the API")
+    parser.add_argument('--check-github', action='store_true',
+                        help="Probe every GitHub URL for public access during enrich")
+    parser.add_argument('--output', default='walrus_haulout_data.csv',
+                        help="CSV path written by the export stage")
+    parser.add_argument('--report', default='fork_report.json',
+                        help="Report path written by the fork stage")
+    parser.add_argument('--rollup-db', default=ROLLUP_DB,
+                        help="SQLite database updated by the rollup stage")
+    parser.add_argument('--target-org', default=os.getenv('TARGET_ORG', 'walrus-haulout'))
+    parser.add_argument('--jobs', type=int, default=4,
+                        help="Maximum number of stages to run concurrently")
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--cache-keep', type=int, default=5,
+                        help="Cached outputs to keep per stage; older ones are deleted (default: 5)")
+    config = parser.parse_args(argv)
+    config.targets = config.targets or ['export', 'rollup']
+    unknown = [name for name in config.targets if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    if config.cache_keep < 1:
+        parser.error("--cache-keep must be at least 1")
+    if config.no_fetch and StageCache(config.cache_dir, 'fetch').latest() is None:
+        parser.error(f"--no-fetch: no fetched snapshot in {config.cache_dir}; run without --no-fetch first")
+    config.sync_existing_forks = os.getenv('SYNC_EXISTING_FORKS', 'true').lower() in ('true', '1', 'yes')
+    return config
+
+
+def main(argv=None):
+    config = parse_args(argv)
+    try:
+        run_pipeline(config.targets, config)
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Pre-aggregated daily and hourly activity rollups, stored in SQLite.
+
+Each snapshot is diffed against the last seen state of every project, and only the
+differences are applied to the aggregate tables. Charts read the small aggregate
+tables, so their cost does not grow with the number of snapshots collected.
+
+Tables:
+    submissions     (grain, bucket, track) -> projects created in the bucket (by ``createdAt``)
+    track_snapshots (grain, bucket, track) -> projects / deployed / likes as of the bucket
+
+Likes and deployment are bucketed by snapshot time rather than ``updatedAt``: the API
+only exposes each project's latest ``updatedAt``, while likes and package IDs are
+point-in-time values that only have a history through repeated snapshots.
+"""
+
+import os
+import sqlite3
+from datetime import datetime, timezone
+
+import pandas as pd
+
+ROLLUP_DB = os.getenv(
+    'ROLLUP_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rollups.sqlite'),
+)
+
+# grain -> strftime format of the bucket label
+GRAINS = {
+    'day': '%Y-%m-%d',
+    'hour': '%Y-%m-%d %H:00',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS project_state (
+    id TEXT PRIMARY KEY,
+    track TEXT NOT NULL,
+    created_at TEXT,
+    deployed INTEGER NOT NULL,
+    likes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS track_totals (
+    track TEXT PRIMARY KEY,
+    projects INTEGER NOT NULL,
+    deployed INTEGER NOT NULL,
+    likes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS submissions (
+    grain TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    track TEXT NOT NULL,
+    submissions INTEGER NOT NULL,
+    PRIMARY KEY (grain, bucket, track)
+);
+CREATE TABLE IF NOT EXISTS track_snapshots (
+    grain TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    track TEXT NOT NULL,
+    projects INTEGER NOT NULL,
+    deployed INTEGER NOT NULL,
+    likes INTEGER NOT NULL,
+    PRIMARY KEY (grain, bucket, track)
+);
+"""
+
+
+def _parse_timestamp(value):
+    """Parse an API ISO-8601 timestamp into an aware UTC datetime (None if missing/invalid)."""
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _bump_submissions(conn, created_at, track, delta):
+    created = _parse_timestamp(created_at)
+    if created is None:
+        return
+    for grain, fmt in GRAINS.items():
+        conn.execute(
+            "INSERT INTO submissions (grain, bucket, track, submissions) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (grain, bucket, track) DO UPDATE SET submissions = submissions + excluded.submissions",
+            (grain, created.strftime(fmt), track, delta),
+        )
+
+
+def _bump_totals(conn, track, projects, deployed, likes):
+    conn.execute(
+        "INSERT INTO track_totals (track, projects, deployed, likes) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (track) DO UPDATE SET projects = projects + excluded.projects, "
+        "deployed = deployed + excluded.deployed, likes = likes + excluded.likes",
+        (track, projects, deployed, likes),
+    )
+
+
+def update_rollups(df, db_path=ROLLUP_DB, snapshot_time=None):
+    """
+    Fold a snapshot of projects into the rollup tables.
+
+    Projects missing from the snapshot keep their last seen state, so partial fetches
+    never undo earlier counts.
+
+    Args:
+        df (DataFrame): Output of ``process_projects``.
+        db_path (str): SQLite database path.
+        snapshot_time (datetime): When the snapshot was taken (defaults to now, UTC).
+
+    Returns:
+        dict: Number of ``new`` and ``changed`` projects applied.
+    """
+    snapshot_time = snapshot_time or datetime.now(timezone.utc)
+    rows = zip(
+        df['id'],
+        df['track'].fillna('Unknown'),
+        df['createdAt'],
+        df['packageId'].notna().astype(int),
+        df['likeCount'].fillna(0).astype(int),
+    )
+    counts = {'new': 0, 'changed': 0}
+
+    # Autocommit mode, so the explicit BEGIN IMMEDIATE below controls the transaction
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    try:
+        conn.executescript(SCHEMA)
+        # Take the write lock before reading state, so concurrent updates cannot apply the same deltas twice
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            state = {
+                row[0]: row[1:]
+                for row in conn.execute("SELECT id, track, created_at, deployed, likes FROM project_state")
+            }
+
+            for project_id, track, created_at, deployed, likes in rows:
+                created_at = created_at if isinstance(created_at, str) else None
+                new = (track, created_at, int(deployed), int(likes))
+                old = state.get(project_id)
+                if old == new:
+                    continue
+
+                if old is None:
+                    counts['new'] += 1
+                    _bump_submissions(conn, created_at, track, 1)
+                    _bump_totals(conn, track, 1, new[2], new[3])
+                else:
+                    counts['changed'] += 1
+                    old_track, old_created_at, old_deployed, old_likes = old
+                    if (old_track, old_created_at) != (track, created_at):
+                        _bump_submissions(conn, old_created_at, old_track, -1)
+                        _bump_submissions(conn, created_at, track, 1)
+                    _bump_totals(conn, old_track, -1, -old_deployed, -old_likes)
+                    _bump_totals(conn, track, 1, new[2], new[3])
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO project_state (id, track, created_at, deployed, likes) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (project_id,) + new,
+                )
+
+            # Record the running totals under this snapshot's buckets (latest snapshot wins)
+            for grain, fmt in GRAINS.items():
+                conn.execute(
+                    "INSERT OR REPLACE INTO track_snapshots (grain, bucket, track, projects, deployed, likes) "
+                    "SELECT ?, ?, track, projects, deployed, likes FROM track_totals",
+                    (grain, snapshot_time.strftime(fmt)),
+                )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    return counts
+
+
+def _read(db_path, query, params):
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        return pd.read_sql_query(query, conn, params=params)
+    except (sqlite3.OperationalError, pd.errors.DatabaseError):
+        return None
+    finally:
+        conn.close()
+
+
+def load_submissions(db_path=ROLLUP_DB, grain='day'):
+    """Return (bucket, track, submissions) rows for ``grain``, or None if no rollups exist."""
+    return _read(
+        db_path,
+        "SELECT bucket, track, submissions FROM submissions "
+        "WHERE grain = ? AND submissions != 0 ORDER BY bucket, track",
+        (grain,),
+    )
+
+
+def load_track_snapshots(db_path=ROLLUP_DB, grain='day'):
+    """Return (bucket, track, projects, deployed, likes) rows for ``grain``, or None if no rollups exist."""
+    return _read(
+        db_path,
+        "SELECT bucket, track, projects, deployed, likes FROM track_snapshots "
+        "WHERE grain = ? ORDER BY bucket, track",
+        (grain,),
+    )
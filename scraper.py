@@ -1,8 +1,11 @@
 import requests
 import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 
+from description_store import DescriptionStore, PREVIEW_CHARS
+
 import os
 from dotenv import load_dotenv
 
@@ -150,13 +153,24 @@ def check_github_accessible(github_url):
     except Exception:
         return False
 
-def process_projects(projects_data):
+def process_projects(projects_data, store=None):
     """
     Process raw project data into a clean DataFrame.
+
+    HTML descriptions are stripped once here and written to the description store;
+    the frame keeps only their hash, a short plain-text preview and the text length.
+
+    Args:
+        projects_data (list): Raw project dictionaries from ``fetch_all_projects``.
+        store (DescriptionStore): Where to put descriptions (defaults to ``DescriptionStore()``).
     """
+    store = store or DescriptionStore()
     processed_list = []
     
     for p in projects_data:
+        html = p.get("description")
+        text = clean_html(html)
+
         # Extract links by type
         links = p.get("links", [])
         github_url = next((l.get("url") for l in links if l.get("type") == "github"), None)
@@ -169,7 +183,9 @@ def process_projects(projects_data):
             "hackathonId": p.get("hackathonId"),
             "createdBy": p.get("createdBy"),
             "projectName": p.get("projectName"),
-            "description": p.get("description"),  # Keep original HTML
+            "description_hash": store.put(html) if html else None,
+            "description_preview": text[:PREVIEW_CHARS],
+            "description_length": len(text),
             "projectLogoUrl": p.get("projectLogoUrl"),
             "track": p.get("track"),
             "bounties": p.get("bounties"),
@@ -191,3 +207,40 @@ def process_projects(projects_data):
     
     df = pd.DataFrame(processed_list)
     return df
+
+def enrich_projects(df, check_github=False):
+    """
+    Derive link-based attributes for each project.
+
+    Args:
+        df (DataFrame): Output of ``process_projects``.
+        check_github (bool): Also probe every GitHub URL for public access (slow, hits the network).
+
+    Returns:
+        DataFrame: ``id``, ``has_demo`` and, if requested, ``github_accessible``.
+    """
+    enriched = pd.DataFrame({
+        "id": df["id"],
+        "has_demo": df["website_url"].notna() | df["youtube_url"].notna(),
+    })
+    if check_github:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            enriched["github_accessible"] = list(pool.map(check_github_accessible, df["github_url"]))
+    return enriched
+
+def score_projects(df):
+    """
+    Compute the PQI quality score (0-10) for each project.
+
+    +3 GitHub link, +3 Package ID, +2 website link, +2 description text longer than 100 chars.
+
+    Returns:
+        DataFrame: ``id`` and ``quality_score``.
+    """
+    score = (
+        df["github_url"].notna() * 3
+        + df["packageId"].notna() * 3
+        + df["website_url"].notna() * 2
+        + (df["description_length"] > 100) * 2
+    )
+    return pd.DataFrame({"id": df["id"], "quality_score": score.astype(int)})
@@ -1,12 +1,20 @@
 #!/usr/bin/env python3
 """
 Fork all GitHub projects from walrus_haulout_data.csv to the target organization.
+
+Usage:
+    python scripts/fork_projects.py                      # serial run, writes fork_report.json
+    python scripts/fork_projects.py --shard 2/4          # one shard, writes fork_journal.2-of-4.jsonl
+    python scripts/fork_projects.py --merge fork_journal.*.jsonl   # combine shard journals into fork_report.json
 """
 
 import os
+import sys
 import csv
 import json
 import time
+import hashlib
+import argparse
 import requests
 from urllib.parse import urlparse
 
@@ -20,12 +28,15 @@ except ImportError:
 # Configuration
 GITHUB_TOKEN = os.getenv('FORK_TOKEN') or os.getenv('GITHUB_TOKEN')
 TARGET_ORG = os.getenv('TARGET_ORG', 'walrus-haulout')
-CSV_FILE = 'walrus_haulout_data.csv'
-REPORT_FILE = 'fork_report.json'
+CSV_FILE = os.getenv('CSV_FILE', 'walrus_haulout_data.csv')
+REPORT_FILE = os.getenv('REPORT_FILE', 'fork_report.json')
 
 # Feature flags
 SYNC_EXISTING_FORKS = os.getenv('SYNC_EXISTING_FORKS', 'true').lower() in ('true', '1', 'yes')
 
+# Delay between operations, avoids GitHub's "submitted too quickly" errors
+OPERATION_DELAY = 10
+
 # GitHub API base URL
 API_BASE = 'https://api.github.com'
 
@@ -206,28 +217,30 @@ def fork_repository(owner, repo, target_org):
 
 
 
-def main():
-    if not GITHUB_TOKEN:
-        print("ERROR: FORK_TOKEN (or GITHUB_TOKEN) environment variable not set")
-        return 1
-    
-    if not os.path.exists(CSV_FILE):
-        print(f"ERROR: CSV file {CSV_FILE} not found")
-        return 1
-    
-    print(f"Starting fork process to organization: {TARGET_ORG}")
-    print(f"Configuration:")
-    print(f"  - Sync existing forks: {'✓ Enabled' if SYNC_EXISTING_FORKS else '✗ Disabled'}")
-    print(f"  - Delay between operations: 10 seconds")
-    print(f"  - Max retries per fork: 10")
-    print(f"Reading projects from: {CSV_FILE}\n")
-    
-    # Read CSV and extract GitHub URLs
+def shard_of(owner, repo, shard_count):
+    """Return the 1-based shard that owns ``owner/repo`` (stable across runs and machines)."""
+    digest = hashlib.sha256(f"{owner}/{repo}".lower().encode('utf-8')).hexdigest()
+    return int(digest, 16) % shard_count + 1
+
+
+def parse_shard(value):
+    """Parse ``i/N`` into (i, N), with 1 <= i <= N."""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N, got {value!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and N, got {value!r}")
+    return index, count
+
+
+def read_projects(csv_file):
+    """Read the CSV and return the projects with a parseable GitHub URL, in file order."""
     projects = []
-    with open(CSV_FILE, 'r', encoding='utf-8') as f:
+    with open(csv_file, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            github_url = row.get('github_url', '').strip()
+            github_url = (row.get('github_url') or '').strip()
             if github_url:
                 owner, repo = parse_github_url(github_url)
                 if owner and repo:
@@ -237,12 +250,78 @@ def main():
                         'owner': owner,
                         'repo': repo
                     })
+    return projects
+
+
+def process_project(project, dry_run=False):
+    """Fork or sync a single project.
+
+    Returns:
+        tuple[dict, str]: (report result, outcome) where outcome is one of
+        'forked', 'synced', 'skipped' or 'failed'.
+    """
+    owner = project['owner']
+    repo = project['repo']
+    result = {
+        'project_name': project['project_name'],
+        'github_url': project['github_url'],
+        'owner': owner,
+        'repo': repo,
+    }
+
+    if dry_run:
+        message = f"Dry run: would process {owner}/{repo}"
+        print(f"  ⏭️  {message}")
+        result.update(action='skip', success=True, message=message)
+        return result, 'skipped'
+
+    # Step 1: Check if fork already exists
+    exists, check_msg = check_fork_exists(owner, repo, TARGET_ORG)
     
-    print(f"Found {len(projects)} projects with GitHub URLs\n")
-    
-    # Fork each repository
+    if not exists:
+        # Fork doesn't exist, create it
+        print(f"  🔄 Creating fork...")
+        success, message = fork_repository(owner, repo, TARGET_ORG)
+        result.update(action='fork', success=success, message=message)
+        if success:
+            print(f"  ✓ {message}")
+            return result, 'forked'
+        print(f"  ✗ {message}")
+        return result, 'failed'
+
+    if "already exists at" not in check_msg:
+        # Repository exists but not a fork of the source - skip
+        print(f"  ⏭️  {check_msg}")
+        result.update(action='skip', success=True, message=check_msg)
+        return result, 'skipped'
+
+    if not SYNC_EXISTING_FORKS:
+        # Sync is disabled, just skip
+        print(f"  ⏭️  Fork already exists (sync disabled)")
+        result.update(
+            action='skip', success=True,
+            message=f"Fork already exists at {TARGET_ORG}/{repo} (sync disabled)"
+        )
+        return result, 'skipped'
+
+    # It's a valid fork and sync is enabled, try to update it
+    print(f"  📦 Fork exists, attempting to sync...")
+    success, message = sync_fork(owner, repo, TARGET_ORG)
+    if success:
+        print(f"  ✓ {message}")
+        result.update(action='sync', success=True, message=message)
+        return result, 'synced'
+
+    # Sync failed, but fork exists - count as skipped, not as a failure
+    print(f"  ⚠️  {message} (fork exists but sync failed)")
+    result.update(action='sync', success=True, message=f"Fork exists ({message})")
+    return result, 'skipped'
+
+
+def build_report(total, entries):
+    """Build the fork report from (index, result, outcome) entries, ordered by CSV position."""
     report = {
-        'total': len(projects),
+        'total': total,
         'successful': 0,
         'failed': 0,
         'skipped': 0,
@@ -250,105 +329,54 @@ def main():
         'forked': 0,
         'results': []
     }
-    
-    for i, project in enumerate(projects, 1):
-        owner = project['owner']
-        repo = project['repo']
-        
-        print(f"[{i}/{len(projects)}] Processing {owner}/{repo}...")
-        
-        # Step 1: Check if fork already exists
-        exists, check_msg = check_fork_exists(owner, repo, TARGET_ORG)
-        
-        if exists:
-            # Repository already exists in target org
-            if "already exists at" in check_msg:
-                # It's a valid fork
-                if SYNC_EXISTING_FORKS:
-                    # Sync is enabled, try to update it
-                    print(f"  📦 Fork exists, attempting to sync...")
-                    success, message = sync_fork(owner, repo, TARGET_ORG)
-                    
-                    result = {
-                        'project_name': project['project_name'],
-                        'github_url': project['github_url'],
-                        'owner': owner,
-                        'repo': repo,
-                        'action': 'sync',
-                        'success': success,
-                        'message': message
-                    }
-                    
-                    if success:
-                        report['successful'] += 1
-                        report['synced'] += 1
-                        print(f"  ✓ {message}")
-                    else:
-                        # Sync failed, but fork exists - count as skipped
-                        report['skipped'] += 1
-                        print(f"  ⚠️  {message} (fork exists but sync failed)")
-                        result['success'] = True  # Don't count as failure
-                        result['message'] = f"Fork exists ({message})"
-                else:
-                    # Sync is disabled, just skip
-                    report['skipped'] += 1
-                    result = {
-                        'project_name': project['project_name'],
-                        'github_url': project['github_url'],
-                        'owner': owner,
-                        'repo': repo,
-                        'action': 'skip',
-                        'success': True,
-                        'message': f"Fork already exists at {TARGET_ORG}/{repo} (sync disabled)"
-                    }
-                    print(f"  ⏭️  Fork already exists (sync disabled)")
-            else:
-                # Repository exists but not a fork of the source - skip
-                report['skipped'] += 1
-                result = {
-                    'project_name': project['project_name'],
-                    'github_url': project['github_url'],
-                    'owner': owner,
-                    'repo': repo,
-                    'action': 'skip',
-                    'success': True,
-                    'message': check_msg
-                }
-                print(f"  ⏭️  {check_msg}")
-        else:
-            # Fork doesn't exist, create it
-            print(f"  🔄 Creating fork...")
-            success, message = fork_repository(owner, repo, TARGET_ORG)
-            
-            result = {
-                'project_name': project['project_name'],
-                'github_url': project['github_url'],
-                'owner': owner,
-                'repo': repo,
-                'action': 'fork',
-                'success': success,
-                'message': message
-            }
-            
-            if success:
-                report['successful'] += 1
-                report['forked'] += 1
-                print(f"  ✓ {message}")
-            else:
-                report['failed'] += 1
-                print(f"  ✗ {message}")
-        
+    for _, result, outcome in sorted(entries, key=lambda entry: entry[0]):
+        if outcome in ('forked', 'synced'):
+            report['successful'] += 1
+        report[outcome] += 1
         report['results'].append(result)
-        
-        # Increased delay between operations (10 seconds)
-        # This helps avoid "submitted too quickly" errors
-        if i < len(projects):
-            time.sleep(10)
-    
-    # Save report
-    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2, ensure_ascii=False)
-    
+    return report
+
+
+def merge_journals(journal_files):
+    """Combine per-shard journals into a single report.
+
+    A journal is JSON lines: a header ``{"shard": [i, N], "total": n}`` followed by one
+    ``{"index": ..., "outcome": ..., "result": {...}}`` line per processed project.
+
+    Returns:
+        tuple[dict, list[str]]: (report, problems) where problems lists missing shards
+        and unfinished journals; the report is only complete if it is empty.
+    """
+    total = 0
+    entries = []
+    problems = []
+    shard_counts = set()
+    seen_shards = set()
+    for path in journal_files:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        if not lines or 'shard' not in lines[0]:
+            raise ValueError(f"{path} is not a fork journal")
+        header, records = lines[0], lines[1:]
+        index, count = header['shard']
+        if index in seen_shards:
+            raise ValueError(f"Shard {index}/{count} appears in more than one journal")
+        seen_shards.add(index)
+        shard_counts.add(count)
+        total += header['total']
+        if len(records) < header['total']:
+            problems.append(f"{path}: only {len(records)} of {header['total']} projects were processed")
+        entries.extend((r['index'], r['result'], r['outcome']) for r in records)
+
+    if len(shard_counts) > 1:
+        raise ValueError(f"Journals come from different shard counts: {sorted(shard_counts)}")
+    missing = set(range(1, max(shard_counts, default=0) + 1)) - seen_shards
+    if missing:
+        problems.append(f"Missing journals for shard(s): {', '.join(map(str, sorted(missing)))}")
+    return build_report(total, entries), problems
+
+
+def print_summary(report):
     print(f"\n{'='*60}")
     print(f"Fork Summary:")
     print(f"  Total: {report['total']}")
@@ -359,6 +387,101 @@ def main():
     print(f"  Failed: {report['failed']}")
     print(f"  Report saved to: {REPORT_FILE}")
     print(f"{'='*60}")
+
+
+def save_report(report):
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fork hackathon projects to the target organization.")
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help="Only process the i-th of N shards (by hashed owner/repo) and write a journal")
+    parser.add_argument('--journal', help="Journal path for --shard (default: fork_journal.<i>-of-<N>.jsonl)")
+    parser.add_argument('--merge', nargs='+', metavar='JOURNAL',
+                        help=f"Merge shard journals into {REPORT_FILE} instead of forking")
+    parser.add_argument('--allow-partial', action='store_true',
+                        help="With --merge, write the report even if shards are missing or unfinished")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Do not call the GitHub API; record every project as skipped")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.merge:
+        report, problems = merge_journals(args.merge)
+        for problem in problems:
+            print(f"⚠️  {problem}")
+        if problems and not args.allow_partial:
+            # Keep the previous complete report rather than overwriting it with a partial one
+            print(f"ERROR: Incomplete shard journals, {REPORT_FILE} not written (use --allow-partial to override)")
+            return 1
+        save_report(report)
+        print_summary(report)
+        return 0
+
+    if not GITHUB_TOKEN and not args.dry_run:
+        print("ERROR: FORK_TOKEN (or GITHUB_TOKEN) environment variable not set")
+        return 1
+    
+    if not os.path.exists(CSV_FILE):
+        print(f"ERROR: CSV file {CSV_FILE} not found")
+        return 1
+    
+    delay = 0 if args.dry_run else OPERATION_DELAY
+    print(f"Starting fork process to organization: {TARGET_ORG}")
+    print(f"Configuration:")
+    print(f"  - Sync existing forks: {'✓ Enabled' if SYNC_EXISTING_FORKS else '✗ Disabled'}")
+    print(f"  - Delay between operations: {delay} seconds")
+    print(f"  - Max retries per fork: 10")
+    if args.shard:
+        print(f"  - Shard: {args.shard[0]}/{args.shard[1]}")
+    if args.dry_run:
+        print(f"  - Dry run: ✓ Enabled")
+    print(f"Reading projects from: {CSV_FILE}\n")
+    
+    # (CSV position, project), so shard results can be merged back in file order
+    projects = list(enumerate(read_projects(CSV_FILE)))
+    print(f"Found {len(projects)} projects with GitHub URLs\n")
+
+    journal = None
+    if args.shard:
+        shard_index, shard_count = args.shard
+        projects = [(i, p) for i, p in projects if shard_of(p['owner'], p['repo'], shard_count) == shard_index]
+        print(f"Shard {shard_index}/{shard_count} owns {len(projects)} projects\n")
+        journal_file = args.journal or f"fork_journal.{shard_index}-of-{shard_count}.jsonl"
+        journal = open(journal_file, 'w', encoding='utf-8')
+        journal.write(json.dumps({'shard': [shard_index, shard_count], 'total': len(projects)}) + '\n')
+    
+    # Fork each repository
+    entries = []
+    try:
+        for n, (index, project) in enumerate(projects, 1):
+            print(f"[{n}/{len(projects)}] Processing {project['owner']}/{project['repo']}...")
+            result, outcome = process_project(project, dry_run=args.dry_run)
+            entries.append((index, result, outcome))
+            if journal:
+                # One line per project, flushed so a killed shard still leaves a usable journal
+                journal.write(json.dumps({'index': index, 'outcome': outcome, 'result': result},
+                                         ensure_ascii=False) + '\n')
+                journal.flush()
+            
+            if n < len(projects) and delay:
+                time.sleep(delay)
+    finally:
+        if journal:
+            journal.close()
+    
+    report = build_report(len(projects), entries)
+    if journal:
+        print(f"\nJournal saved to: {journal.name}")
+        print(f"Merge shards with: python scripts/fork_projects.py --merge fork_journal.*.jsonl")
+    else:
+        save_report(report)
+        print_summary(report)
     
     # Always return 0 to allow the workflow to continue and upload the report
     # Failures are logged in the report and printed to stdout
@@ -368,4 +491,4 @@ def main():
     return 0
 
 if __name__ == '__main__':
-    exit(main())
+    sys.exit(main())